@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
+from functools import lru_cache
+import re
 
 # --- CRITICAL: Force Light Mode (Enhanced) ---
 st.set_page_config(
@@ -14,248 +15,157 @@ st.set_page_config(
 )
 
 # Enhanced CSS to force light mode across all browsers and accounts
-st.markdown("""
-<style>
-    /* Force light mode at root level */
-    :root {
-        color-scheme: light only !important;
-    }
-    
-    html, body, [data-testid="stAppViewContainer"], .main, .stApp {
-        color-scheme: light !important;
-        background-color: #FFFFFF !important;
-        color: #000000 !important;
-        forced-color-adjust: none !important;
-    }
-
-    /* Override all text colors */
-    * {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-    }
-    
-    /* Specific overrides for input fields */
-    input, textarea, select, button, label, p, span, div {
-        color: #000000 !important;
-        background-color: #FFFFFF !important;
-        -webkit-text-fill-color: #000000 !important;
-    }
-    
-    /* Number input styling - Light gray background with black text */
-    input[type="number"] {
-        background-color: #F5F5F5 !important;
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-        border: 1px solid #CCCCCC !important;
-        border-radius: 4px !important;
-        padding: 8px !important;
-    }
-    
-    /* Number input when focused */
-    input[type="number"]:focus {
-        background-color: #FFFFFF !important;
-        border: 2px solid #2196F3 !important;
-        outline: none !important;
-    }
-    
-    /* Radio buttons and labels */
-    .stRadio label, .stRadio p {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-    }
-    
-    /* Plotly charts */
-    .stPlotlyChart, .js-plotly-plot, .plotly {
-        background-color: #FFFFFF !important;
-    }
-    
-    .stPlotlyChart svg text {
-        fill: #000000 !important;
-    }
-
-    /* Title */
-    h1 {
-        color: #1976D2 !important;
-        -webkit-text-fill-color: #1976D2 !important;
-        font-size: 40px !important;
-        text-align: center;
-        font-weight: bold;
-    }
-    
-    /* Subheaders */
-    h2, h3 {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-    }
-    
-    /* Labels */
-    .stNumberInput label, .stSelectbox label, .stFileUploader label {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-        font-weight: bold;
-    }   
-    
-    /* Button styling */
-    div.stButton > button:first-child {
-        background-color: #2196F3 !important;
-        color: white !important;
-        -webkit-text-fill-color: white !important;
-        border-radius: 8px;
-        height: 3em;
-        width: 100%;
-        font-size: 16px;
-        border: none;
-    }
-    
-    div.stButton > button:first-child:hover {
-        background-color: #1976D2 !important;
-    }
-    
-    /* Success message */
-    .stSuccess {
-        background-color: #C8E6C9 !important;
-        color: #1B5E20 !important;
-        -webkit-text-fill-color: #1B5E20 !important;
-    }
-    
-    /* Info boxes */
-    .stInfo {
-        background-color: #E3F2FD !important;
-        color: #0D47A1 !important;
-        -webkit-text-fill-color: #0D47A1 !important;
-    }
-    
-    /* Metrics */
-    .stMetric {
-        background-color: #F5F5F5 !important;
-        padding: 10px;
-        border-radius: 8px;
-    }
-    
-    .stMetric label, .stMetric div {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-    }
-    
-    /* File uploader */
-    .stFileUploader {
-        background-color: #F5F5F5 !important;
-        border-radius: 8px;
-        padding: 8px;
-    }
-    
-    /* Expander */
-    .streamlit-expanderHeader {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-        background-color: #F5F5F5 !important;
-    }
-    
-    /* Remove any filters that might invert colors */
-    * {
-        filter: none !important;
-        -webkit-filter: none !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def _css():
+    return (Path(__file__).parent / "static" / "app.css").read_text(encoding="utf-8")
+
+
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
 
 
 # --- Wind Load Calculation Function ---
+# Fundamental basic wind velocity: 100 km/h in m/s
+V_B0 = 100 / 3.6
+
+
+@lru_cache(maxsize=None)
+def _kr(z0):
+    # Terrain factor, depends only on the roughness length
+    return 0.19 * (z0 / 0.05) ** 0.07
+
+
+def _wind_core(z, half_rho, inv_z0, kr, vb, c0, kl, Fx_scale, Fy_scale):
+    # ln(z/z0) feeds both the roughness factor and the turbulence intensity;
+    # every step writes into one of the returned arrays, so nothing else is allocated
+    logz = np.multiply(z, inv_z0)
+    np.log(logz, out=logz)
+    vm = np.multiply(logz, kr * c0 * vb)
+    Iv = np.reciprocal(logz, out=logz)
+    Iv *= kl / c0
+    q_p = np.square(vm)
+    # Fwy holds the (1 + 7*Iv) factor until it is overwritten with the load
+    Fwy = np.multiply(Iv, 7.0)
+    Fwy += 1.0
+    q_p *= Fwy
+    q_p *= half_rho
+    np.multiply(q_p, Fy_scale, out=Fwy)
+    Fwx = np.multiply(q_p, Fx_scale)
+    return vm, Iv, q_p, Fwy, Fwx
+
+
+@st.cache_data(max_entries=64)
 def calculate_wind_load(H, omega, g, rho_air, Ax=303.3, Ay=592.5, z0=0.01, c_dir=1, c_season=1, c0=1, cp=1.2):
-    z = np.arange(1, H + 1)
-    v_b0 = 100 / 3.6
-    vb = c_dir * c_season * v_b0
-    kr = 0.19 * (z0 / 0.05) ** 0.07
-    cr = kr * np.log(z / z0)
-    vm = cr * c0 * vb
-    vm_max = vm[-1]
+    # Single precision is ample for the displayed results and halves the memory traffic;
+    # every scalar reaching the kernel is float32 so no step promotes the profile to float64
+    f32 = np.float32
+    z = np.arange(1, int(H) + 1, dtype=f32)
+    vb = f32(c_dir * c_season * V_B0)
+    kr = f32(_kr(z0))
     kl = 1
-    Iv = kl / (c0 * np.log(z / z0))
-    q_p = 0.5 * rho_air * (vm ** 2) * (1 + 7 * Iv)
-    Fwy = q_p * cp * Ay / 1e3
-    Fwx = q_p * cp * Ax / 1e3
-    return {'z': z, 'vm': vm, 'vm_max': vm_max, 'Fwy': Fwy, 'Fwx': Fwx, 'q_p': q_p, 'Iv': Iv}
+    # Multiply by the reciprocal rather than dividing every height by z0
+    inv_z0 = f32(1.0 / z0)
+    # Pressure-to-load factors in kN, folded into a single multiply per direction
+    Fx_scale = f32(cp * Ax * 1e-3)
+    Fy_scale = f32(cp * Ay * 1e-3)
+    half_rho = f32(0.5 * rho_air)
+    vm, Iv, q_p, Fwy, Fwx = _wind_core(z, half_rho, inv_z0, kr, vb, f32(c0), f32(kl), Fx_scale, Fy_scale)
+    vm_max = float(vm[-1])
+    return {'z': z, 'vm': vm, 'vm_max': vm_max, 'Fwy': Fwy, 'Fwx': Fwx, 'q_p': q_p, 'Iv': Iv,
+            'Fwx_max': float(Fwx[-1]), 'Fwy_max': float(Fwy[-1])}
 
 
 # --- File Reader ---
+# Keyed on the raw bytes, so re-uploading the same file skips decoding and parsing
+@st.cache_data(max_entries=16, show_spinner=False)
+def _parse_parameters(raw):
+    # Four scalars do not warrant np.loadtxt's tokenizer; split by hand.
+    # Like loadtxt, strip '#' comments, accept values on one line or several and
+    # reject empty fields; utf-8-sig drops the BOM that Excel's "CSV UTF-8" export writes
+    values = []
+    for line in raw.decode('utf-8-sig').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        fields = re.split(r'\s*[,;]\s*|\s+', line)
+        if '' in fields:
+            raise ValueError(f"empty field in line '{line}'")
+        values.extend(float(f) for f in fields)
+    return values
+
+
 def read_parameter_file(uploaded_file):
     try:
-        data = np.loadtxt(uploaded_file, delimiter=",")
+        data = _parse_parameters(uploaded_file.getvalue())
         if len(data) != 4:
             st.error("❌ File must contain exactly 4 numeric values: H, g, rho_air, omega_rpm")
             return None
         H, g, rho_air, omega_rpm = data
-        return float(H), float(g), float(rho_air), float(omega_rpm)
+        return H, g, rho_air, omega_rpm
     except Exception as e:
         st.error(f"Error reading file: {e}")
         return None
 
 
 # --- Plotly Plots with explicit light theme ---
-def create_interactive_plots(results):
+# The profiles are smooth and monotonic, so a few hundred points draw them faithfully
+def _plot_index(size, n=200):
+    if size <= n:
+        return slice(None)
+    return np.linspace(0, size - 1, n).astype(np.intp)
+
+
+# Explicit axis styling for light theme
+_AXIS = dict(
+    gridcolor='#E0E0E0',
+    linecolor='#000000',
+    title_font=dict(color='#000000'),
+    tickfont=dict(color='#000000')
+)
+
+
+# Cached on the scalar inputs so reruns with unchanged parameters skip both the kernel and the figure build;
+# the metric scalars are returned alongside so the display never unpickles the full results again
+@st.cache_resource(max_entries=32)
+def create_interactive_plots(H, omega, g, rho_air):
+    results = calculate_wind_load(H, omega, g, rho_air)
     fig = make_subplots(
         rows=1, cols=2,
+        shared_yaxes=True,
         subplot_titles=('Wind Load Distribution', 'Wind Velocity Profile'),
         horizontal_spacing=0.12
     )
     
-    fig.add_trace(
-        go.Scatter(
-            x=results['Fwy'], y=results['z'], mode='lines', name='Y-direction',
+    # One index and one height array shared by every trace
+    idx = _plot_index(len(results['z']))
+    z = results['z'][idx]
+
+    # Build every trace up front and add them in one pass
+    traces = [
+        go.Scattergl(
+            x=results['Fwy'][idx], y=z, mode='lines', name='Y-direction',
             line=dict(color='#00BCD4', width=3),
             hovertemplate='Load: %{x:.2f} kN<br>Height: %{y} m<extra></extra>'
         ),
-        row=1, col=1
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=results['Fwx'], y=results['z'], mode='lines', name='X-direction',
+        go.Scattergl(
+            x=results['Fwx'][idx], y=z, mode='lines', name='X-direction',
             line=dict(color='#FF9800', width=3),
             hovertemplate='Load: %{x:.2f} kN<br>Height: %{y} m<extra></extra>'
         ),
-        row=1, col=1
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=results['vm'], y=results['z'], mode='lines', name='Mean Wind Velocity',
+        go.Scattergl(
+            x=results['vm'][idx], y=z, mode='lines', name='Mean Wind Velocity',
             line=dict(color='#4CAF50', width=3),
             hovertemplate='Velocity: %{x:.2f} m/s<br>Height: %{y} m<extra></extra>'
         ),
-        row=1, col=2
-    )
+    ]
+    fig.add_traces(traces, rows=[1, 1, 1], cols=[1, 1, 2])
 
-    # Explicit axis styling for light theme
-    fig.update_xaxes(
-        title_text="Wind Load [kN]", row=1, col=1, 
-        gridcolor='#E0E0E0',
-        linecolor='#000000',
-        title_font=dict(color='#000000'),
-        tickfont=dict(color='#000000')
-    )
-    fig.update_xaxes(
-        title_text="Wind Velocity [m/s]", row=1, col=2, 
-        gridcolor='#E0E0E0',
-        linecolor='#000000',
-        title_font=dict(color='#000000'),
-        tickfont=dict(color='#000000')
-    )
-    fig.update_yaxes(
-        title_text="Height [m]", row=1, col=1, 
-        gridcolor='#E0E0E0',
-        linecolor='#000000',
-        title_font=dict(color='#000000'),
-        tickfont=dict(color='#000000')
-    )
-    fig.update_yaxes(
-        title_text="Height [m]", row=1, col=2, 
-        gridcolor='#E0E0E0',
-        linecolor='#000000',
-        title_font=dict(color='#000000'),
-        tickfont=dict(color='#000000')
-    )
-    
-    # Force light theme layout
+    # Force light theme layout, axes included, in a single update
     fig.update_layout(
+        xaxis={**_AXIS, 'title_text': 'Wind Load [kN]'},
+        xaxis2={**_AXIS, 'title_text': 'Wind Velocity [m/s]'},
+        yaxis={**_AXIS, 'title_text': 'Height [m]'},
+        # Shares the height axis with the load plot, so it carries no title of its own
+        yaxis2=_AXIS,
         height=600, 
         plot_bgcolor='white', 
         paper_bgcolor='white',
@@ -280,10 +190,22 @@ def create_interactive_plots(results):
     )
     
     # Update subplot titles color
-    for annotation in fig['layout']['annotations']:
-        annotation['font'] = dict(color='#000000', size=14)
+    fig.update_annotations(font=dict(color='#000000', size=14))
     
-    return fig
+    summary = {k: results[k] for k in ('vm_max', 'Fwx_max', 'Fwy_max')}
+    return fig, summary
+
+
+# --- Results Display ---
+def show_results(H, omega, g, rho_air):
+    with st.spinner("Calculating..."):
+        fig, summary = create_interactive_plots(int(H), omega, g, rho_air)
+        st.success("✅ Calculation Complete!")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Max Velocity", f"{summary['vm_max']:.2f} m/s")
+        col2.metric("Max Load (X)", f"{summary['Fwx_max']:.2f} kN")
+        col3.metric("Max Load (Y)", f"{summary['Fwy_max']:.2f} kN")
+        st.plotly_chart(fig, use_container_width=True)
 
 
 # --- App UI ---
@@ -294,26 +216,22 @@ mode = st.radio("Select Input Mode", ["Manual Input", "Upload Parameters File"])
 if mode == "Manual Input":
     st.subheader("📊 Manual Parameter Input")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        H = st.number_input("Total Height (H) [m]", value=66.7, min_value=1.0)
-        omega_rpm = st.number_input("Angular Velocity (ω) [RPM]", value=2.0, min_value=0.0)
+    # Inputs only take effect on submit, so editing a field does not rerun the page
+    with st.form("manual"):
+        col1, col2 = st.columns(2)
+        with col1:
+            H = st.number_input("Total Height (H) [m]", value=66.7, min_value=1.0)
+            omega_rpm = st.number_input("Angular Velocity (ω) [RPM]", value=2.0, min_value=0.0)
+        with col2:
+            g = st.number_input("Gravity (g) [m/s²]", value=9.81)
+            rho_air = st.number_input("Air Density (ρ) [kg/m³]", value=1.225, format="%.3f")
+        submitted = st.form_submit_button("Calculate Wind Load")
+
+    if submitted:
+        # Shown outside the form so it always matches the submitted RPM
         omega = omega_rpm * 2 * np.pi / 60
         st.info(f"ω = {omega:.4f} rad/s")
-    with col2:
-        g = st.number_input("Gravity (g) [m/s²]", value=9.81)
-        rho_air = st.number_input("Air Density (ρ) [kg/m³]", value=1.225, format="%.3f")
-
-    if st.button("Calculate Wind Load"):
-        with st.spinner("Calculating..."):
-            results = calculate_wind_load(int(H), omega, g, rho_air)
-            st.success("✅ Calculation Complete!")
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Max Velocity", f"{results['vm_max']:.2f} m/s")
-            col2.metric("Max Load (X)", f"{results['Fwx'][-1]:.2f} kN")
-            col3.metric("Max Load (Y)", f"{results['Fwy'][-1]:.2f} kN")
-            fig = create_interactive_plots(results)
-            st.plotly_chart(fig, use_container_width=True)
+        show_results(H, omega, g, rho_air)
 
 else:
     st.subheader("📁 Upload Parameter File")
@@ -326,15 +244,7 @@ else:
             omega = omega_rpm * 2 * np.pi / 60
             st.info(f"✅ Loaded parameters: H={H} m, g={g}, ρ={rho_air}, ω={omega_rpm} RPM")
             if st.button("Calculate Wind Load"):
-                with st.spinner("Calculating..."):
-                    results = calculate_wind_load(int(H), omega, g, rho_air)
-                    st.success("✅ Calculation Complete!")
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric("Max Velocity", f"{results['vm_max']:.2f} m/s")
-                    col2.metric("Max Load (X)", f"{results['Fwx'][-1]:.2f} kN")
-                    col3.metric("Max Load (Y)", f"{results['Fwy'][-1]:.2f} kN")
-                    fig = create_interactive_plots(results)
-                    st.plotly_chart(fig, use_container_width=True)
+                show_results(H, omega, g, rho_air)
 
 
 with st.expander("ℹ️ About Input Parameters"):